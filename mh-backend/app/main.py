@@ -1,8 +1,12 @@
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
 from app.routes.dars_routes import router as dars_router
 
 app = FastAPI()
 
+# Parsed DARS reports are large, repetitive JSON; compress anything over 1KB
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 app.include_router(dars_router, prefix="/api/dars", tags=["DARS"])
 
 @app.get("/")
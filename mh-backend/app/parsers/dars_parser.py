@@ -1,11 +1,76 @@
 # app/parsers/enhanced_dars_parser.py
 
+import os
 import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
 
+# Patterns used by EnhancedDarsParser, compiled once at import rather than
+# looked up in re's internal cache on every extraction call
+_PREPARED_CHECK_RE = re.compile(r'Prepared:\s*\d{2}/\d{2}/\d{2}', re.IGNORECASE)
+# Literal identifiers with a case-insensitive fallback; reports print them in
+# upper case, so the plain substring test almost always settles it
+_REQUIRED_LITERALS = [
+    (literal, re.compile(re.escape(literal), re.IGNORECASE))
+    for literal in ('DEGREE AUDIT REPORTING SYSTEM', 'DARS')
+]
+# \b keeps these from retrying their leading run at every offset inside a
+# long word or digit string, which is quadratic when no match follows
+_NAME_RE = re.compile(r'\b(\w+),(\w+)')
+_STUDENT_ID_RE = re.compile(r'(\d{10})')
+_CATALOG_RE = re.compile(r'Catalog Year:\s*(\d{4,5})')
+_PROGRAM_RE = re.compile(r'Program Code:\s*([A-Z0-9]+)')
+_ALT_CATALOG_RE = re.compile(r'Alternate Catalog Year:\s*(\d{4,5})')
+_ADMIT_RE = re.compile(r'Admit Type:\s*([A-Z]+)')
+_ADVISOR_SECTION_RE = re.compile(r'ADVISORS:(.*?)(?=HS UNITS:|$)', re.DOTALL)
+_PREP_RE = re.compile(r'Prepared:\s*(\d{2}/\d{2}/\d{2})\s*-\s*(\d{2}:\d{2})\s*(\d+)')
+_MAJOR_RE = re.compile(r'MAJOR:\s*(\d{2}/\d{2}/\d{2})\s*(\d+)\s*(.+)')
+_CERT_RE = re.compile(r'CERTIF:\s*(\d{2}/\d{2}/\d{2})\s*(\d+)\s*(.+)')
+_GPA_RE = re.compile(r'\b(\d+\.\d+)\s+GPA CRED\.\s+EARNED\s+(\d+\.\d+)\s+POINTS\s+(\d+\.\d+)\s+GPA')
+_EARNED_RE = re.compile(r'EARNED:\s*(\d+\.\d+)\s+CREDITS')
+_INP_RE = re.compile(r'IN-PROGRESS\s+(\d+\.\d+)\s+CREDITS')
+_NEEDS_RE = re.compile(r'NEEDS:\s*(\d+\.\d+)\s+CREDITS')
+# The advanced standing block is located by its header and then searched
+# forward from there; a single 'HEADER.*?TOTALS' pattern would rescan to the
+# end of the text from every header occurrence when TOTALS is missing
+_ADV_HEADER = 'ADVANCED STANDING CREDITS'
+_ADV_TOTALS_RE = re.compile(r'TOTALS\*\*\s+(\d+)\s+(\d+)')
+# Course lines are anchored to the start of a line and every field is bounded
+# to horizontal whitespace, so a failed match can never run on into the
+# following lines and the work per line stays linear
+_COURSE_RE = re.compile(
+    r'^[ \t]*([A-Z]{2}\d{2})[ \t]+([A-Z&][A-Z &]{0,30}?)(\d{3,4}[A-Z]{0,3})[ \t]+(\d{1,3}\.\d{1,2})[ \t]+([A-Z]{1,3})[ \t]*([^\n]*)',
+    re.MULTILINE
+)
+_MARKERS_RE = re.compile(r'>[RDSX]')
+_IN_PROGRESS_SECTION_RE = re.compile(r'IN-PROGRESS courses(.*?)(?=-{5,}|$)', re.DOTALL)
+# Single whitespace characters around the lazy title: \s+ on either side
+# would compete with .*? for the same whitespace run on a line with no term
+_TERM_HEADER_RE = re.compile(r'IP\s(.*?)\s\(([A-Z]{2}\d{2})\)')
+_IP_COURSE_RE = re.compile(r'([A-Z]{2}\d{2})[ \t]+([A-Z&][A-Z &]{0,30}?)(\d{3,4}[A-Z]{0,3})[ \t]+(\d{1,3}\.\d{1,2})[ \t]+INP[ \t]*(.*)')
+# The name must start with a non-space so [ \t]+ and the name never compete
+# for the same whitespace on an unterminated header line
+_REQ_HEADER_RE = re.compile(r'^[ \t]*(NO|YES)[ \t]+(\S[^\n]*)\n', re.MULTILINE)
+_SECTION_END_RE = re.compile(r'\*{5,}')
+_CRS_RE = re.compile(r'\b(\d+)\s+crs', re.IGNORECASE)
+_NOTE_RES = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'Complete\s+([^.]+\.)',
+        r'Must\s+([^.]+\.)',
+        r'Note:\s*([^.]+\.)',
+        r'See\s+GUIDE\s+for\s+([^.]+\.)'
+    )
+]
+_HS_SECTION_RE = re.compile(r'HS UNITS:(.*?)(?=ADVANCED STANDING|$)', re.DOTALL)
+# The unit type is whole words each followed by whitespace, so no two
+# quantifiers can claim the same whitespace before the unit count
+_HS_UNIT_RE = re.compile(r'\b([A-Z]+):\s*((?:[A-Z]+\s+)+)([\d\.]+)')
+
 class RequirementStatus(Enum):
     COMPLETE = "complete"
     INCOMPLETE = "incomplete"
@@ -29,6 +94,9 @@ class CourseGrade(Enum):
     CR = "CR"  # Credit
     N = "N"    # No Credit
 
+# Grades that count as passing (C or better for most purposes)
+PASSING_GRADES = frozenset({'A', 'AB', 'B', 'BC', 'C', 'P', 'S', 'CR', 'T'})
+
 @dataclass
 class Course:
     term: str
@@ -47,8 +115,7 @@ class Course:
     @property
     def is_passing_grade(self) -> bool:
         """Check if grade is passing (C or better for most purposes)"""
-        passing_grades = {'A', 'AB', 'B', 'BC', 'C', 'P', 'S', 'CR', 'T'}
-        return self.grade in passing_grades
+        return self.grade in PASSING_GRADES
 
 @dataclass
 class Requirement:
@@ -96,17 +163,6 @@ class GpaInfo:
 class EnhancedDarsParser:
     """Enhanced DARS parser with improved error handling and data validation"""
     
-    def __init__(self):
-        self.course_pattern = re.compile(
-            r'([A-Z]{2}\d{2})\s+([A-Z\s&]+?)(\d{3,4}[A-Z]*)\s+(\d+\.\d+)\s+([A-Z]+)\s*(.*?)(?=\n|$)',
-            re.IGNORECASE
-        )
-        self.requirement_patterns = {
-            'complete': re.compile(r'^\s*\+\s*(.+?)(?:satisfied|complete)', re.IGNORECASE | re.MULTILINE),
-            'incomplete': re.compile(r'^\s*-\s*(.+?)(?:NEEDS?|not\s+satisfied)', re.IGNORECASE | re.MULTILINE),
-            'in_progress': re.compile(r'^\s*IP\+?\s*(.+)', re.IGNORECASE | re.MULTILINE)
-        }
-    
     def parse_dars_report(self, text: str) -> Dict[str, Any]:
         """Main parsing method that orchestrates the entire parsing process"""
         try:
@@ -145,45 +201,42 @@ class EnhancedDarsParser:
             raise ValueError("Empty DARS report provided")
         
         # Check for key DARS identifiers
-        required_patterns = [
-            r'Prepared:\s*\d{2}/\d{2}/\d{2}',
-            r'DEGREE AUDIT REPORTING SYSTEM',
-            r'DARS'
-        ]
-        
-        for pattern in required_patterns:
-            if not re.search(pattern, text, re.IGNORECASE):
-                raise ValueError(f"DARS report missing required pattern: {pattern}")
+        if not _PREPARED_CHECK_RE.search(text):
+            raise ValueError(f"DARS report missing required pattern: {_PREPARED_CHECK_RE.pattern}")
+        
+        for literal, pattern in _REQUIRED_LITERALS:
+            if literal not in text and not pattern.search(text):
+                raise ValueError(f"DARS report missing required pattern: {literal}")
     
     def _extract_student_info(self, text: str) -> StudentInfo:
         """Extract comprehensive student information"""
         # Extract student name (more robust pattern)
-        name_match = re.search(r'(\w+),(\w+)', text)
+        name_match = _NAME_RE.search(text)
         name = f"{name_match.group(2)} {name_match.group(1)}" if name_match else "Unknown"
         
         # Extract student ID from filename or document
-        student_id_match = re.search(r'(\d{10})', text)
+        student_id_match = _STUDENT_ID_RE.search(text)
         student_id = student_id_match.group(1) if student_id_match else ""
         
         # Extract catalog year
-        catalog_year_match = re.search(r'Catalog Year:\s*(\d{4,5})', text)
+        catalog_year_match = _CATALOG_RE.search(text)
         catalog_year = catalog_year_match.group(1) if catalog_year_match else ""
         
         # Extract program code
-        program_code_match = re.search(r'Program Code:\s*([A-Z0-9]+)', text)
+        program_code_match = _PROGRAM_RE.search(text)
         program_code = program_code_match.group(1) if program_code_match else ""
         
         # Extract alternate catalog year
-        alt_catalog_match = re.search(r'Alternate Catalog Year:\s*(\d{4,5})', text)
+        alt_catalog_match = _ALT_CATALOG_RE.search(text)
         alt_catalog_year = alt_catalog_match.group(1) if alt_catalog_match else ""
         
         # Extract admit type
-        admit_type_match = re.search(r'Admit Type:\s*([A-Z]+)', text)
+        admit_type_match = _ADMIT_RE.search(text)
         admit_type = admit_type_match.group(1) if admit_type_match else ""
         
         # Extract advisors
         advisors = []
-        advisor_section = re.search(r'ADVISORS:(.*?)(?=HS UNITS:|$)', text, re.DOTALL)
+        advisor_section = _ADVISOR_SECTION_RE.search(text)
         if advisor_section:
             advisor_lines = advisor_section.group(1).strip().split('\n')
             for line in advisor_lines:
@@ -204,7 +257,7 @@ class EnhancedDarsParser:
     
     def _extract_preparation_info(self, text: str) -> Dict[str, str]:
         """Extract report preparation information"""
-        prep_match = re.search(r'Prepared:\s*(\d{2}/\d{2}/\d{2})\s*-\s*(\d{2}:\d{2})\s*(\d+)', text)
+        prep_match = _PREP_RE.search(text)
         
         if prep_match:
             date_str, time_str, report_id = prep_match.groups()
@@ -231,10 +284,7 @@ class EnhancedDarsParser:
         }
         
         # Look for major/certificate declarations
-        major_pattern = r'MAJOR:\s*(\d{2}/\d{2}/\d{2})\s*(\d+)\s*(.+)'
-        cert_pattern = r'CERTIF:\s*(\d{2}/\d{2}/\d{2})\s*(\d+)\s*(.+)'
-        
-        for match in re.finditer(major_pattern, text):
+        for match in _MAJOR_RE.finditer(text):
             date, code, name = match.groups()
             programs['majors'].append({
                 'date_declared': date,
@@ -243,7 +293,7 @@ class EnhancedDarsParser:
                 'type': 'major'
             })
         
-        for match in re.finditer(cert_pattern, text):
+        for match in _CERT_RE.finditer(text):
             date, code, name = match.groups()
             programs['certificates'].append({
                 'date_declared': date,
@@ -263,8 +313,7 @@ class EnhancedDarsParser:
     def _extract_gpa_info(self, text: str) -> GpaInfo:
         """Extract comprehensive GPA information"""
         # Look for GPA information in the earned credits section
-        gpa_pattern = r'(\d+\.\d+)\s+GPA CRED\.\s+EARNED\s+(\d+\.\d+)\s+POINTS\s+(\d+\.\d+)\s+GPA'
-        gpa_match = re.search(gpa_pattern, text)
+        gpa_match = _GPA_RE.search(text)
         
         if gpa_match:
             credits_earned = float(gpa_match.group(1))
@@ -291,19 +340,21 @@ class EnhancedDarsParser:
         }
         
         # Extract earned credits
-        earned_match = re.search(r'EARNED:\s*(\d+\.\d+)\s+CREDITS', text)
+        earned_match = _EARNED_RE.search(text)
         if earned_match:
             summary['total_earned'] = float(earned_match.group(1))
         
         # Extract in-progress credits
-        in_progress_match = re.search(r'IN-PROGRESS\s+(\d+\.\d+)\s+CREDITS', text)
+        in_progress_match = _INP_RE.search(text)
         if in_progress_match:
             summary['total_in_progress'] = float(in_progress_match.group(1))
         
         # Extract advanced standing credits
-        advanced_match = re.search(r'ADVANCED STANDING CREDITS.*?TOTALS\*\*\s+(\d+)\s+(\d+)', text, re.DOTALL)
-        if advanced_match:
-            summary['advanced_standing'] = float(advanced_match.group(1))
+        advanced_start = text.find(_ADV_HEADER)
+        if advanced_start != -1:
+            advanced_match = _ADV_TOTALS_RE.search(text, advanced_start + len(_ADV_HEADER))
+            if advanced_match:
+                summary['advanced_standing'] = float(advanced_match.group(1))
         
         return summary
     
@@ -311,10 +362,8 @@ class EnhancedDarsParser:
         """Extract all courses from the transcript"""
         courses = []
         
-        # Pattern to match course lines
-        course_pattern = r'([A-Z]{2}\d{2})\s+([A-Z\s&]+?)(\d{3,4}[A-Z]*)\s+(\d+\.\d+)\s+([A-Z]+)\s*(.*?)(?=\n|$)'
-        
-        for match in re.finditer(course_pattern, text, re.MULTILINE):
+        # Match course lines
+        for match in _COURSE_RE.finditer(text):
             term = match.group(1)
             subject_parts = match.group(2).strip().split()
             course_num = match.group(3)
@@ -329,8 +378,9 @@ class EnhancedDarsParser:
             is_repeatable = '>R' in title
             is_duplicate = '>D' in title
             
-            # Clean title of special markers
-            title = re.sub(r'>R|>D|>S|>X', '', title).strip()
+            # Clean title of special markers (most titles have none)
+            if '>' in title:
+                title = _MARKERS_RE.sub('', title).strip()
             
             course = Course(
                 term=term,
@@ -352,7 +402,7 @@ class EnhancedDarsParser:
         in_progress_courses = []
         
         # Find the IN-PROGRESS section
-        in_progress_section = re.search(r'IN-PROGRESS courses(.*?)(?=-{5,}|$)', text, re.DOTALL)
+        in_progress_section = _IN_PROGRESS_SECTION_RE.search(text)
         if not in_progress_section:
             return in_progress_courses
         
@@ -365,13 +415,13 @@ class EnhancedDarsParser:
                 continue
             
             # Check for term headers
-            term_match = re.match(r'IP\s+(.*?)\s+\(([A-Z]{2}\d{2})\)', line)
+            term_match = _TERM_HEADER_RE.match(line)
             if term_match:
                 current_term = term_match.group(2)
                 continue
             
             # Check for course lines
-            course_match = re.match(r'([A-Z]{2}\d{2})\s+([A-Z\s&]+?)(\d{3,4}[A-Z]*)\s+(\d+\.\d+)\s+INP\s*(.*)', line)
+            course_match = _IP_COURSE_RE.match(line)
             if course_match and current_term:
                 subject_parts = course_match.group(2).strip().split()
                 subject = " ".join(subject_parts)
@@ -395,10 +445,21 @@ class EnhancedDarsParser:
         """Extract degree requirements with detailed status"""
         requirements = []
         
-        # Find requirements sections (could be multiple degree programs)
-        req_sections = re.findall(r'(NO|YES)\s+([^\n]+?)\n(.*?)(?=(?:NO|YES)\s+[^\n]+?\n|\*{5,}|$)', text, re.DOTALL)
+        # Find requirement headers (could be multiple degree programs) in one
+        # pass; each section runs to the next header or a ***** separator
+        headers = list(_REQ_HEADER_RE.finditer(text))
         
-        for completion_status, req_name, req_content in req_sections:
+        for i, header in enumerate(headers):
+            completion_status, req_name = header.groups()
+            content_start = header.end()
+            content_end = headers[i + 1].start() if i + 1 < len(headers) else len(text)
+            
+            separator = _SECTION_END_RE.search(text, content_start, content_end)
+            if separator:
+                content_end = separator.start()
+            
+            req_content = text[content_start:content_end]
+            
             # Skip if this looks like a course listing rather than requirement
             if any(pattern in req_name.lower() for pattern in ['other courses', 'courses taken']):
                 continue
@@ -418,22 +479,22 @@ class EnhancedDarsParser:
             credits_in_progress = 0.0
             
             # Look for credit requirements
-            credit_match = re.search(r'(\d+)\s+crs', req_content, re.IGNORECASE)
+            credit_match = _CRS_RE.search(req_content)
             if credit_match:
                 credits_needed = float(credit_match.group(1))
             
             # Look for earned credits
-            earned_match = re.search(r'EARNED:\s*(\d+\.\d+)\s+CREDITS', req_content)
+            earned_match = _EARNED_RE.search(req_content)
             if earned_match:
                 credits_earned = float(earned_match.group(1))
             
             # Look for in-progress credits
-            in_progress_match = re.search(r'IN-PROGRESS\s+(\d+\.\d+)\s+CREDITS', req_content)
+            in_progress_match = _INP_RE.search(req_content)
             if in_progress_match:
                 credits_in_progress = float(in_progress_match.group(1))
             
             # Look for remaining credits needed
-            needs_match = re.search(r'NEEDS:\s*(\d+\.\d+)\s+CREDITS', req_content)
+            needs_match = _NEEDS_RE.search(req_content)
             if needs_match:
                 credits_needed = credits_earned + credits_in_progress + float(needs_match.group(1))
             
@@ -467,9 +528,7 @@ class EnhancedDarsParser:
         courses = []
         
         # Look for course lines within the requirement
-        course_pattern = r'([A-Z]{2}\d{2})\s+([A-Z\s&]+?)(\d{3,4}[A-Z]*)\s+(\d+\.\d+)\s+([A-Z]+)\s*(.*?)(?=\n|$)'
-        
-        for match in re.finditer(course_pattern, req_content, re.MULTILINE):
+        for match in _COURSE_RE.finditer(req_content):
             term = match.group(1)
             subject = match.group(2).strip()
             number = match.group(3)
@@ -493,16 +552,13 @@ class EnhancedDarsParser:
         """Extract any special notes or conditions for a requirement"""
         notes = []
         
+        # Every note ends in '.', so nothing past the last one can match; cut
+        # it off rather than let each pattern rescan an unterminated tail
+        req_content = req_content[:req_content.rfind('.') + 1]
+        
         # Look for common note patterns
-        note_patterns = [
-            r'Complete\s+([^.]+\.)',
-            r'Must\s+([^.]+\.)',
-            r'Note:\s*([^.]+\.)',
-            r'See\s+GUIDE\s+for\s+([^.]+\.)'
-        ]
-        
-        for pattern in note_patterns:
-            matches = re.findall(pattern, req_content, re.IGNORECASE)
+        for pattern in _NOTE_RES:
+            matches = pattern.findall(req_content)
             notes.extend(matches)
         
         return ' '.join(notes)
@@ -511,13 +567,12 @@ class EnhancedDarsParser:
         """Extract high school unit information"""
         hs_units = {}
         
-        hs_section = re.search(r'HS UNITS:(.*?)(?=ADVANCED STANDING|$)', text, re.DOTALL)
+        hs_section = _HS_SECTION_RE.search(text)
         if hs_section:
             content = hs_section.group(1)
             
             # Parse different subject areas
-            unit_pattern = r'([A-Z]+):\s*([A-Z\s]+)\s+([\d\.]+)'
-            for match in re.finditer(unit_pattern, content):
+            for match in _HS_UNIT_RE.finditer(content):
                 subject = match.group(1)
                 unit_type = match.group(2).strip()
                 units = float(match.group(3))
@@ -531,9 +586,11 @@ class EnhancedDarsParser:
         """Extract advanced standing credit information"""
         advanced_credits = []
         
-        advanced_section = re.search(r'ADVANCED STANDING CREDITS(.*?)TOTALS', text, re.DOTALL)
-        if advanced_section:
-            content = advanced_section.group(1)
+        header_start = text.find(_ADV_HEADER)
+        content_start = header_start + len(_ADV_HEADER)
+        content_end = text.find('TOTALS', content_start) if header_start != -1 else -1
+        if content_end != -1:
+            content = text[content_start:content_end]
             
             # Parse advanced standing entries
             for line in content.split('\n'):
@@ -600,15 +657,27 @@ class EnhancedDarsParser:
         
         return warnings
 
+# The parser holds no per-report state, so helpers share a single instance
+_default_parser = EnhancedDarsParser()
+
 # Example usage and helper functions
 def parse_dars_file(file_path: str) -> Dict[str, Any]:
     """Parse a DARS file and return structured data"""
-    parser = EnhancedDarsParser()
-    
     with open(file_path, 'r', encoding='utf-8') as f:
         content = f.read()
     
-    return parser.parse_dars_report(content)
+    return _default_parser.parse_dars_report(content)
+
+def parse_dars_files(file_paths: List[str], workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Parse several DARS files across worker processes, preserving input order"""
+    if not file_paths:
+        return []
+    
+    workers = min(workers or os.cpu_count() or 1, len(file_paths))
+    chunksize = max(1, len(file_paths) // (4 * workers))
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(parse_dars_file, file_paths, chunksize=chunksize))
 
 def validate_certificate_eligibility(parsed_data: Dict[str, Any]) -> bool:
     """Check if student is eligible for certificate programs"""
@@ -623,6 +692,9 @@ def validate_certificate_eligibility(parsed_data: Dict[str, Any]) -> bool:
 
 def generate_degree_audit_summary(parsed_data: Dict[str, Any]) -> Dict[str, Any]:
     """Generate a comprehensive summary of the degree audit"""
+    # Count requirement statuses in a single pass
+    status_counts = Counter(r.status for r in parsed_data['requirements'])
+    
     summary = {
         'student_overview': {
             'name': parsed_data['student_info'].name,
@@ -637,9 +709,9 @@ def generate_degree_audit_summary(parsed_data: Dict[str, Any]) -> Dict[str, Any]
         },
         'requirements_status': {
             'total_requirements': len(parsed_data['requirements']),
-            'completed_requirements': len([r for r in parsed_data['requirements'] if r.status == RequirementStatus.COMPLETE]),
-            'in_progress_requirements': len([r for r in parsed_data['requirements'] if r.status == RequirementStatus.IN_PROGRESS]),
-            'remaining_requirements': len([r for r in parsed_data['requirements'] if r.status == RequirementStatus.INCOMPLETE])
+            'completed_requirements': status_counts[RequirementStatus.COMPLETE],
+            'in_progress_requirements': status_counts[RequirementStatus.IN_PROGRESS],
+            'remaining_requirements': status_counts[RequirementStatus.INCOMPLETE]
         },
         'next_steps': [],
         'warnings': parsed_data['parsing_metadata']['warnings']
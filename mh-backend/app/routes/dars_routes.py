@@ -1,12 +1,10 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, status
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request, status
 from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
 import pdfplumber
 import logging
-from typing import Dict, Any, Optional
-from app.parsers.dars_parser import EnhancedDarsParser, parse_dars_file, validate_certificate_eligibility, generate_degree_audit_summary
-import tempfile
-import os
-from pathlib import Path
+from typing import Dict, Any, Tuple
+from app.parsers.dars_parser import EnhancedDarsParser, validate_certificate_eligibility, generate_degree_audit_summary
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -16,6 +14,42 @@ router = APIRouter()
 # Initialize the enhanced parser
 dars_parser = EnhancedDarsParser()
 
+def _extract_pdf_text(pdf_file) -> Tuple[str, int]:
+    """
+    Extract the text of every page in a PDF.
+    
+    pdfplumber's layout analysis is CPU-bound, so async handlers should call
+    this through run_in_threadpool rather than directly on the event loop.
+    
+    Args:
+        pdf_file: File-like object containing the PDF
+        
+    Returns:
+        Tuple of (extracted text, number of pages in the PDF)
+    """
+    parts = []
+    with pdfplumber.open(pdf_file) as pdf:
+        for page_num, page in enumerate(pdf.pages, 1):
+            try:
+                # Blank or image-only pages have no characters; skip the layout pass
+                if not page.chars:
+                    logger.warning(f"No text found on page {page_num}")
+                    continue
+                
+                extracted = page.extract_text()
+                if extracted:
+                    parts.append(extracted)
+                    parts.append("\n")
+                    logger.debug(f"Extracted text from page {page_num}")
+                else:
+                    logger.warning(f"No text found on page {page_num}")
+            except Exception as page_error:
+                logger.warning(f"Failed to extract text from page {page_num}: {str(page_error)}")
+                continue
+        
+        # Join once instead of growing a string page by page
+        return "".join(parts), len(pdf.pages)
+
 @router.post("/parse")
 async def parse_dars(file: UploadFile = File(...)) -> Dict[str, Any]:
     """
@@ -51,28 +85,15 @@ async def parse_dars(file: UploadFile = File(...)) -> Dict[str, Any]:
         )
     
     try:
-        # Extract text from PDF
-        text = ""
+        # Extract text from PDF off the event loop
         logger.info(f"Processing DARS file: {file.filename}")
+        text, page_count = await run_in_threadpool(_extract_pdf_text, file.file)
         
-        with pdfplumber.open(file.file) as pdf:
-            if not pdf.pages:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="PDF file appears to be empty or corrupted"
-                )
-            
-            for page_num, page in enumerate(pdf.pages, 1):
-                try:
-                    extracted = page.extract_text()
-                    if extracted:
-                        text += extracted + "\n"
-                        logger.debug(f"Extracted text from page {page_num}")
-                    else:
-                        logger.warning(f"No text found on page {page_num}")
-                except Exception as page_error:
-                    logger.warning(f"Failed to extract text from page {page_num}: {str(page_error)}")
-                    continue
+        if not page_count:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="PDF file appears to be empty or corrupted"
+            )
         
         if not text.strip():
             raise HTTPException(
@@ -82,14 +103,14 @@ async def parse_dars(file: UploadFile = File(...)) -> Dict[str, Any]:
         
         # Parse the extracted text using enhanced parser
         logger.info("Parsing extracted DARS text")
-        parsed_data = dars_parser.parse_dars_report(text)
+        parsed_data = await run_in_threadpool(dars_parser.parse_dars_report, text)
         
         # Add file metadata
         parsed_data['file_metadata'] = {
             'filename': file.filename,
             'content_type': file.content_type,
             'file_size': file.size,
-            'pages_processed': len(pdf.pages) if 'pdf' in locals() else 0
+            'pages_processed': page_count
         }
         
         # Validate certificate eligibility (from original logic)
@@ -165,12 +186,7 @@ async def validate_dars_file(file: UploadFile = File(...)) -> Dict[str, Any]:
     
     try:
         # Extract text
-        text = ""
-        with pdfplumber.open(file.file) as pdf:
-            for page in pdf.pages:
-                extracted = page.extract_text()
-                if extracted:
-                    text += extracted + "\n"
+        text, page_count = await run_in_threadpool(_extract_pdf_text, file.file)
         
         # Try to validate format
         dars_parser._validate_dars_format(text)
@@ -182,7 +198,7 @@ async def validate_dars_file(file: UploadFile = File(...)) -> Dict[str, Any]:
             'file_info': {
                 'filename': file.filename,
                 'size': file.size,
-                'pages': len(pdf.pages),
+                'pages': page_count,
                 'text_length': len(text)
             }
         }
@@ -209,9 +225,6 @@ async def validate_dars_file(file: UploadFile = File(...)) -> Dict[str, Any]:
         }
 
 # Error handler for better error responses
-from fastapi import Request
-from fastapi.responses import JSONResponse
-
 async def dars_exception_handler(request: Request, exc: Exception):
     """Custom exception handler for DARS parsing errors"""
     logger.error(f"DARS parsing error on {request.url}: {str(exc)}")